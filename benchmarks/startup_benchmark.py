@@ -0,0 +1,92 @@
+"""
+Startup benchmark.
+
+Measures how long a fresh interpreter takes to import each framework module, which heavy
+optional dependencies the import pulls in, and how long spawned sweep workers take to start.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--repeats 5] [--workers 4]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    'quant_backtesting_framework',
+    'quant_backtesting_framework.data_handler',
+    'quant_backtesting_framework.backtest_engine',
+    'quant_backtesting_framework.portfolio',
+    'quant_backtesting_framework.results_store',
+    'quant_backtesting_framework.checkpoint',
+]
+HEAVY_DEPENDENCIES = ['yfinance', 'ta']
+
+IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import(module, repeats):
+    """
+    Import a module in fresh interpreters and return the median import time and the heavy dependencies loaded.
+    """
+    timings = []
+    loaded = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        loaded = result['loaded']
+    return statistics.median(timings), loaded
+
+
+def _import_data_handler(_):
+    # Imported in the task rather than a pool initializer so that import errors propagate instead of
+    # making the pool respawn workers forever
+    import quant_backtesting_framework.data_handler  # noqa: F401
+    return os.getpid()
+
+
+def measure_worker_spin_up(workers):
+    """
+    Return the seconds needed to spawn a pool of workers that import the data handler and run one task each.
+    """
+    context = multiprocessing.get_context('spawn')
+    start = time.perf_counter()
+    with context.Pool(workers) as pool:
+        pool.map(_import_data_handler, range(workers))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        try:
+            seconds, loaded = measure_import(module, args.repeats)
+        except subprocess.CalledProcessError as error:
+            print(f"{module:<45} failed: {error.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"{module:<45} {seconds * 1000:8.1f} ms  heavy: {', '.join(loaded) or '-'}")
+
+    sys.path.insert(0, REPO_ROOT)
+    seconds = measure_worker_spin_up(args.workers)
+    print(f"{'spawn pool of ' + str(args.workers) + ' workers':<45} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
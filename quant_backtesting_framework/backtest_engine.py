@@ -1,38 +1,154 @@
 class BacktestEngine:
-    def __init__(self, strategy, portfolio, execution_handler, risk_manager, data_handler):
+    def __init__(self, strategy, portfolio, execution_handler, risk_manager, data_handler, results_writer=None,
+                 checkpoint_manager=None, keep_history=True):
+        if not keep_history and results_writer is None:
+            raise ValueError("keep_history=False requires a results_writer")
         self.strategy = strategy
         self.portfolio = portfolio
         self.execution_handler = execution_handler
         self.risk_manager = risk_manager
         self.data_handler = data_handler
+        self.results_writer = results_writer
+        self.checkpoint_manager = checkpoint_manager
+        self.keep_history = keep_history
+        self.peak_value = None
 
-    def run_backtest(self):
+    def run_backtest(self, start_index=0):
         """
-        Runs the backtest simulation.
+        Runs the backtest simulation. With a checkpoint_manager, starting from the first bar replaces any
+        earlier run in its checkpoint directory and in the results writer's run.
+
+        Args:
+        start_index (int): The index of the first bar to process. Earlier bars are skipped.
         """
-        for current_date in self.data_handler.get_dates():
+        if start_index == 0 and self.checkpoint_manager is not None:
+            self.checkpoint_manager.start_run(self)
+        for bar_index, current_date in enumerate(self.data_handler.get_dates()):
+            if bar_index < start_index:
+                continue
+
             # Update market data
             market_data = self.data_handler.get_current_data(current_date)
 
-            # Generate trading signals
-            signals = self.strategy.generate_signals(market_data)
+            self.process_bar(current_date, market_data)
+            self.checkpoint(bar_index + 1)
+
+        if self.results_writer is not None:
+            self.results_writer.flush()
+
+    def run_pipelined_backtest(self, prefetcher, start_index=0, bar_data=None):
+        """
+        Runs the backtest simulation on data chunks loaded in the background, so fetching and parsing
+        the next chunks overlaps with simulating the current one.
+
+        The chunks must be consecutive slices of one series that do not share any date, as produced by
+        DataHandler.stream_custom_data. Splitting a series into separate fetch_data calls does not work,
+        because each call recomputes indicators and resampling from scratch at the chunk boundaries.
 
-            # Process each signal
-            for signal in signals:
-                # Check risk management constraints
-                if self.risk_manager.assess_trade_risk(self.portfolio, signal):
-                    # Simulate order execution
-                    executed_price, transaction_cost = self.execution_handler.execute_order(signal)
+        Each bar is handed to the strategy and portfolio as bar_data(current_date, rows), the same per-bar
+        market data that data_handler.get_current_data provides to run_backtest.
 
-                    # Update portfolio
-                    self.portfolio.update_position(signal.ticker, signal.quantity, executed_price, signal.signal_type)
-                    self.portfolio.adjust_for_transaction_cost(transaction_cost)
+        Args:
+        prefetcher (ChunkPrefetcher): Yields (index, chunk) pairs in time order, each chunk a DataFrame indexed by date.
+        start_index (int): The index of the first bar to process. Earlier bars are skipped.
+        bar_data (callable): Builds the market data of a bar from its date and rows. Defaults to close_price.
+        """
+        if bar_data is None:
+            bar_data = self.close_price
+        if start_index == 0 and self.checkpoint_manager is not None:
+            self.checkpoint_manager.start_run(self)
+        bar_index = 0
+        for _, chunk in prefetcher:
+            for current_date, rows in chunk.groupby(level=0, sort=False):
+                if bar_index >= start_index:
+                    self.process_bar(current_date, bar_data(current_date, rows))
+                    self.checkpoint(bar_index + 1)
+                bar_index += 1
 
-            # Update portfolio value
-            self.portfolio.calculate_total_value(market_data)
+        if self.results_writer is not None:
+            self.results_writer.flush()
 
-            # Log performance metrics
-            # ...
+    def resume_backtest(self, prefetcher=None, bar_data=None):
+        """
+        Restores the engine from the latest checkpoint and continues the backtest from there.
+
+        Args:
+        prefetcher (ChunkPrefetcher): If given, the backtest continues with run_pipelined_backtest on its chunks.
+            It must be a new prefetcher, one that was consumed by the crashed run cannot be iterated again.
+        bar_data (callable): Passed on to run_pipelined_backtest.
+        """
+        if self.checkpoint_manager is None:
+            raise ValueError("resume_backtest requires a checkpoint_manager")
+        start_index = self.checkpoint_manager.restore(self)
+        if prefetcher is not None:
+            self.run_pipelined_backtest(prefetcher, start_index=start_index, bar_data=bar_data)
+        else:
+            self.run_backtest(start_index=start_index)
+
+    @staticmethod
+    def close_price(current_date, rows):
+        """
+        Returns the close price of a bar, the market data Portfolio.calculate_total_value expects.
+        """
+        return float(rows['close'].iloc[-1])
+
+    def process_bar(self, current_date, market_data):
+        """
+        Generates signals, executes trades and updates the portfolio for a single bar.
+        """
+        # Generate trading signals
+        signals = self.strategy.generate_signals(market_data)
+
+        # Process each signal
+        for signal in signals:
+            # Check risk management constraints
+            if self.risk_manager.assess_trade_risk(self.portfolio, signal):
+                # Simulate order execution
+                executed_price, transaction_cost = self.execution_handler.execute_order(signal)
+
+                # Update portfolio
+                n_transactions = len(self.portfolio.transaction_log)
+                self.portfolio.update_position(signal.ticker, signal.quantity, executed_price, signal.signal_type)
+                self.portfolio.adjust_for_transaction_cost(transaction_cost)
+                if self.results_writer is not None and len(self.portfolio.transaction_log) > n_transactions:
+                    self.results_writer.record_fill(current_date, *self.portfolio.transaction_log[-1])
+
+        # Update portfolio value
+        self.portfolio.calculate_total_value(market_data)
+
+        # Log performance metrics
+        if self.peak_value is None or self.portfolio.total_value > self.peak_value:
+            self.peak_value = self.portfolio.total_value
+        if self.results_writer is not None:
+            self.results_writer.record_equity(current_date, self.portfolio.total_value, self.portfolio.cash)
+            self.results_writer.record_metrics(current_date,
+                                               drawdown=self.calculate_drawdown(),
+                                               n_positions=len(self.portfolio.positions),
+                                               volatility=getattr(self.risk_manager, 'volatility', None))
+
+        # The results writer holds the full history, so memory stays bounded on long runs
+        if not self.keep_history:
+            self.portfolio.transaction_log.clear()
+            self.portfolio.total_value_history.clear()
+
+    def calculate_drawdown(self):
+        """
+        Returns the current drawdown of the portfolio from its peak value.
+        """
+        if not self.peak_value:
+            return 0.0
+        return (self.peak_value - self.portfolio.total_value) / self.peak_value
+
+    def checkpoint(self, cursor):
+        """
+        Writes a snapshot if one is due after the given number of processed bars.
+        """
+        if self.checkpoint_manager is None or not self.checkpoint_manager.should_checkpoint(cursor):
+            return
+        # Stored results must not run ahead of the snapshot they are resumed from
+        if self.results_writer is not None:
+            self.results_writer.flush()
+        self.checkpoint_manager.save(self, cursor)
 
     # Additional methods for logging, performance tracking, etc.
 
@@ -41,4 +157,14 @@ class BacktestEngine:
 # Initialize all components and pass them to the backtest engine
 backtest_engine = BacktestEngine(strategy, portfolio, execution_handler, risk_manager, data_handler)
 backtest_engine.run_backtest()
+
+# Checkpoint every 10000 bars and resume after a crash
+checkpoint_manager = CheckpointManager('checkpoints/run_a', every_n_bars=10000)
+backtest_engine = BacktestEngine(strategy, portfolio, execution_handler, risk_manager, data_handler,
+                                 checkpoint_manager=checkpoint_manager)
+backtest_engine.resume_backtest()
+
+# Read and parse the CSV file on a background thread while the engine simulates
+chunks = data_handler.stream_custom_data('aapl.csv', '2015-01-01', '2023-12-31', frequency='1min', chunk_rows=100000)
+backtest_engine.run_pipelined_backtest(chunks)
 """
\ No newline at end of file
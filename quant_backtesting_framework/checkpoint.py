@@ -0,0 +1,239 @@
+import os
+import pickle
+import zlib
+
+
+class CheckpointManager:
+    """
+    The CheckpointManager periodically snapshots the state of a BacktestEngine so a long run can be resumed.
+
+    Each checkpoint is written as zlib-compressed pickles. A snapshot file holds the scalar and position
+    state: the first one is a full base, later ones only hold the values that changed. Every max_snapshots
+    snapshots a new base is written and the older snapshot files are removed. The entries appended to the
+    portfolio history lists go to a separate history segment per checkpoint, which is never rewritten, so
+    the cost of a checkpoint does not grow with the length of the run.
+
+    When the engine does not keep its history in memory (keep_history=False) no history segments are
+    written, since the results writer already stores that data.
+
+    Attributes:
+    checkpoint_dir (str): The directory holding the snapshot and history files.
+    every_n_bars (int): The number of bars between two snapshots.
+    max_snapshots (int): The number of incremental snapshots written before a new base.
+    """
+    SNAPSHOT = 'snapshot'
+    HISTORY = 'history'
+    HISTORIES = ('transaction_log', 'total_value_history')
+
+    def __init__(self, checkpoint_dir, every_n_bars=1000, max_snapshots=100):
+        if not isinstance(every_n_bars, int) or every_n_bars <= 0:
+            raise ValueError("every_n_bars must be a positive integer")
+        if not isinstance(max_snapshots, int) or max_snapshots <= 0:
+            raise ValueError("max_snapshots must be a positive integer")
+        self.checkpoint_dir = checkpoint_dir
+        self.every_n_bars = every_n_bars
+        self.max_snapshots = max_snapshots
+        self._saved = None
+        self._since_base = 0
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def should_checkpoint(self, cursor):
+        """
+        Return whether a snapshot is due after the given number of processed bars.
+        """
+        return cursor > 0 and cursor % self.every_n_bars == 0
+
+    def save(self, engine, cursor):
+        """
+        Write a snapshot of the engine state. The run must have been started with start_run or resumed
+        with restore first.
+
+        Args:
+        engine (BacktestEngine): The engine to snapshot.
+        cursor (int): The index of the next bar to process.
+        """
+        scalars, positions, histories = self._collect(engine)
+        saved = self._saved
+        if saved is None and (self._sequences(self.SNAPSHOT) or self._sequences(self.HISTORY)):
+            raise ValueError("checkpoint_dir holds an earlier run, call start_run or restore before saving")
+        sequence = self._next_sequence()
+
+        lengths = {}
+        if histories is not None:
+            offsets = saved['lengths'] if saved is not None else {name: 0 for name in self.HISTORIES}
+            if any(len(histories[name]) < offsets[name] for name in self.HISTORIES):
+                raise ValueError("Portfolio histories must only be appended to between checkpoints")
+            self._write(self.HISTORY, sequence, {name: histories[name][offsets[name]:] for name in self.HISTORIES})
+            lengths = {name: len(histories[name]) for name in self.HISTORIES}
+
+        base = saved is None or self._since_base >= self.max_snapshots
+        if base:
+            snapshot = {
+                'cursor': cursor,
+                'base': True,
+                'scalars': scalars,
+                'positions': dict(positions),
+                'removed_positions': [],
+            }
+        else:
+            snapshot = {
+                'cursor': cursor,
+                'base': False,
+                'scalars': {key: value for key, value in scalars.items()
+                            if key not in saved['scalars'] or saved['scalars'][key] != value},
+                'positions': {ticker: quantity for ticker, quantity in positions.items()
+                              if saved['positions'].get(ticker) != quantity},
+                'removed_positions': [ticker for ticker in saved['positions'] if ticker not in positions],
+            }
+        self._write(self.SNAPSHOT, sequence, snapshot)
+
+        if base:
+            self._remove(self.SNAPSHOT, lambda existing: existing < sequence)
+            self._since_base = 0
+        else:
+            self._since_base += 1
+        self._saved = {'scalars': scalars, 'positions': dict(positions), 'lengths': lengths}
+
+    def load(self, load_history=True):
+        """
+        Replay the files on disk into a single state.
+
+        Args:
+        load_history (bool): Whether to rebuild the history lists from the history segments.
+
+        Returns:
+        dict: The merged state, or None if there is no checkpoint.
+        """
+        sequences = self._sequences(self.SNAPSHOT)
+        snapshots = []
+        for sequence in reversed(sequences):
+            snapshots.append(self._read(self.SNAPSHOT, sequence))
+            if snapshots[-1]['base']:
+                break
+        if not snapshots or not snapshots[-1]['base']:
+            return None
+        state = {'scalars': {}, 'positions': {}, 'histories': {name: [] for name in self.HISTORIES}}
+        for snapshot in reversed(snapshots):
+            state['cursor'] = snapshot['cursor']
+            state['scalars'].update(snapshot['scalars'])
+            state['positions'].update(snapshot['positions'])
+            for ticker in snapshot['removed_positions']:
+                state['positions'].pop(ticker, None)
+        if load_history:
+            # A segment without a matching snapshot was left by a crash in the middle of a save
+            for sequence in self._sequences(self.HISTORY):
+                if sequence <= sequences[-1]:
+                    segment = self._read(self.HISTORY, sequence)
+                    for name in self.HISTORIES:
+                        state['histories'][name].extend(segment[name])
+        self._since_base = len(snapshots) - 1
+        return state
+
+    def restore(self, engine):
+        """
+        Restore the engine from the latest checkpoint. Without a checkpoint, anything the results writer
+        stored for the run is removed, since the backtest starts again from the first bar.
+
+        Args:
+        engine (BacktestEngine): The engine to restore.
+
+        Returns:
+        int: The index of the next bar to process, 0 if there is no checkpoint.
+        """
+        keep_history = getattr(engine, 'keep_history', True)
+        state = self.load(load_history=keep_history)
+        if state is None:
+            self.start_run(engine)
+            return 0
+        last_sequence = self._sequences(self.SNAPSHOT)[-1]
+        self._remove(self.HISTORY, lambda existing: existing > last_sequence)
+
+        scalars = state['scalars']
+        portfolio = engine.portfolio
+        portfolio.cash = scalars['portfolio.cash']
+        portfolio.total_value = scalars['portfolio.total_value']
+        portfolio.positions = dict(state['positions'])
+        portfolio.transaction_log = state['histories']['transaction_log']
+        portfolio.total_value_history = state['histories']['total_value_history']
+        engine.peak_value = scalars.get('engine.peak_value')
+        if engine.risk_manager is not None:
+            engine.risk_manager.volatility = scalars['risk_manager.volatility']
+        if scalars.get('execution_handler.open_orders') is not None:
+            engine.execution_handler.open_orders = list(scalars['execution_handler.open_orders'])
+        if engine.results_writer is not None:
+            engine.results_writer.truncate(scalars.get('results_writer.chunk_counts') or {})
+        self._saved = {
+            'scalars': dict(scalars),
+            'positions': dict(state['positions']),
+            'lengths': {name: len(state['histories'][name]) for name in self.HISTORIES} if keep_history else {},
+        }
+        return state['cursor']
+
+    def start_run(self, engine):
+        """
+        Start a new run from the first bar. The checkpoints of any earlier run are removed, and so is
+        everything the results writer stored for the run, so neither is mixed into the new run.
+
+        Args:
+        engine (BacktestEngine): The engine about to start.
+        """
+        if engine.results_writer is not None:
+            engine.results_writer.truncate({})
+        self.clear()
+
+    def clear(self):
+        """
+        Remove all snapshots and history segments.
+        """
+        self._remove(self.SNAPSHOT, lambda existing: True)
+        self._remove(self.HISTORY, lambda existing: True)
+        self._saved = None
+        self._since_base = 0
+
+    def _collect(self, engine):
+        portfolio = engine.portfolio
+        open_orders = getattr(engine.execution_handler, 'open_orders', None)
+        scalars = {
+            'portfolio.cash': portfolio.cash,
+            'portfolio.total_value': portfolio.total_value,
+            'engine.peak_value': getattr(engine, 'peak_value', None),
+            'risk_manager.volatility': getattr(engine.risk_manager, 'volatility', None),
+            'execution_handler.open_orders': list(open_orders) if open_orders is not None else None,
+            'results_writer.chunk_counts': (engine.results_writer.chunk_counts()
+                                            if engine.results_writer is not None else None),
+        }
+        histories = None
+        if getattr(engine, 'keep_history', True):
+            histories = {
+                'transaction_log': portfolio.transaction_log,
+                'total_value_history': portfolio.total_value_history,
+            }
+        return scalars, portfolio.positions, histories
+
+    def _path(self, kind, sequence):
+        return os.path.join(self.checkpoint_dir, f"{kind}_{sequence:08d}.ckpt")
+
+    def _sequences(self, kind):
+        prefix = kind + '_'
+        return sorted(int(name[len(prefix):-len('.ckpt')]) for name in os.listdir(self.checkpoint_dir)
+                      if name.startswith(prefix) and name.endswith('.ckpt'))
+
+    def _next_sequence(self):
+        sequences = self._sequences(self.SNAPSHOT)
+        return sequences[-1] + 1 if sequences else 0
+
+    def _write(self, kind, sequence, data):
+        path = self._path(kind, sequence)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(tmp_path, path)
+
+    def _read(self, kind, sequence):
+        with open(self._path(kind, sequence), 'rb') as f:
+            return pickle.loads(zlib.decompress(f.read()))
+
+    def _remove(self, kind, condition):
+        for existing in self._sequences(kind):
+            if condition(existing):
+                os.remove(self._path(kind, existing))
@@ -1,7 +1,9 @@
-import yfinance as yf
-import ta
+import threading
 import pandas as pd
 
+# yf.download keeps its results in module-level state, so concurrent downloads must not overlap
+_yf_download_lock = threading.Lock()
+
 class DataHandler:
     def __init__(self):
         # Initialization, if needed
@@ -28,11 +30,14 @@ class DataHandler:
                 data = self.preprocess_data(data, 
                                             frequency=frequency)
         else:
-            data = yf.download(ticker, 
-                            start=start_date, 
-                            end=end_date,
-                            interval=interval,
-                            auto_adjust=True)
+            # Imported here so that backtests from local files do not pay for loading yfinance
+            import yfinance as yf
+            with _yf_download_lock:
+                data = yf.download(ticker, 
+                                start=start_date, 
+                                end=end_date,
+                                interval=interval,
+                                auto_adjust=True)
             data = self.lower_column_names(data)
             
         if add_all_technical_indicator:
@@ -40,7 +45,104 @@ class DataHandler:
             
         return data
 
-    def load_custom_data(self, 
+    def prefetch_data(self, requests, max_prefetch:int=4, num_workers:int=2):
+        """
+        Fetch data for several requests on background threads, yielding (request, data) pairs in order.
+        Each request is a dict of fetch_data keyword arguments, e.g. one per ticker of a universe.
+        CSV files are read and parsed concurrently, but downloads from yfinance are serialized because
+        yf.download is not thread-safe.
+        """
+        # Imported here so that the module still works when run as a script from the package directory
+        from quant_backtesting_framework.prefetch import DataPrefetcher
+        return DataPrefetcher(lambda request: self.fetch_data(**request),
+                              requests,
+                              max_prefetch=max_prefetch,
+                              num_workers=num_workers)
+
+    def stream_custom_data(self,
+                           custom_filepath:str,
+                           start_date:str,
+                           end_date:str,
+                           frequency:str=None,
+                           chunk_rows:int=100000,
+                           max_prefetch:int=4):
+        """
+        Read and parse a CSV file in chunks on a background thread, yielding (index, data) pairs.
+        See iter_custom_data for how the chunks are built. The returned ChunkPrefetcher can only be
+        iterated once, call this again to read the file again, e.g. when resuming a backtest.
+        """
+        # Imported here so that the module still works when run as a script from the package directory
+        from quant_backtesting_framework.prefetch import ChunkPrefetcher
+        return ChunkPrefetcher(self.iter_custom_data(custom_filepath,
+                                                     start_date,
+                                                     end_date,
+                                                     frequency=frequency,
+                                                     chunk_rows=chunk_rows),
+                               max_prefetch=max_prefetch)
+
+    def iter_custom_data(self,
+                         custom_filepath:str,
+                         start_date:str,
+                         end_date:str,
+                         frequency:str=None,
+                         chunk_rows:int=100000):
+        """
+        Load custom data from a CSV file in chunks of consecutive dates, reading the file only once.
+
+        Concatenating the chunks gives the same data as load_custom_data, followed by preprocess_data when a
+        frequency is given. The file must be sorted by date. Rows sharing a date are never split across
+        chunks, and each chunk is resampled together with the last row of the previous one, so the forward
+        fill carries over chunk boundaries. Technical indicators need the full series and are not added here.
+        """
+        # Last raw row, last emitted index and resampling origin of the chunks yielded so far
+        state = {'previous': None, 'last_index': None, 'origin': None}
+        carry = None
+        for data in pd.read_csv(custom_filepath, chunksize=chunk_rows):
+            data = self.lower_column_names(data)
+            data['date'] = pd.to_datetime(data['date'])
+            data = data.set_index('date').dropna()
+            if carry is not None:
+                data = pd.concat([carry, data])
+            if data.empty:
+                continue
+            if not data.index.is_monotonic_increasing:
+                raise ValueError("custom_filepath must be sorted by date to be read in chunks")
+            # Hold back the rows of the last date, the next chunk may contain more of them
+            last_date = data.index[-1]
+            carry = data[data.index == last_date]
+            chunk = self._finish_chunk(data[data.index < last_date], start_date, end_date, frequency, state)
+            if chunk is not None:
+                yield chunk
+        if carry is not None:
+            chunk = self._finish_chunk(carry, start_date, end_date, frequency, state)
+            if chunk is not None:
+                yield chunk
+
+    def _finish_chunk(self, data, start_date, end_date, frequency, state):
+        """
+        Slice a chunk to the date range and resample it after the previous chunk.
+        Returns None if nothing is left.
+        """
+        data = data.loc[start_date:end_date]
+        if data.empty:
+            return None
+        last_row = data.iloc[-1:]
+        if frequency is not None:
+            # Use the grid of a single resample over the whole series
+            if state['origin'] is None:
+                state['origin'] = data.index[0].normalize()
+            if state['previous'] is not None:
+                data = pd.concat([state['previous'], data])
+            data = data.resample(frequency, origin=state['origin']).ffill()
+            if state['last_index'] is not None:
+                data = data[data.index > state['last_index']]
+        state['previous'] = last_row
+        if data.empty:
+            return None
+        state['last_index'] = data.index[-1]
+        return data
+
+    def load_custom_data(self,
                          custom_filepath:str, 
                          start_date:str, 
                          end_date:str) -> pd.DataFrame:
@@ -69,6 +171,7 @@ class DataHandler:
         Add technical indicators to the data.
         """
         # Implement technical indicator logic here
+        import ta
         data = ta.add_all_ta_features(data, 
                                       open="open", 
                                       high="high", 
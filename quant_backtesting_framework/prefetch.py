@@ -0,0 +1,122 @@
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DataPrefetcher:
+    """
+    The DataPrefetcher loads data chunks on background threads while the caller consumes earlier ones.
+
+    At most max_prefetch chunks are loaded or waiting ahead of the consumer, so memory stays bounded.
+    Chunks are yielded in the order of the requests, whatever order the loads complete in, and an
+    exception raised by the loader is re-raised when its chunk is reached.
+
+    Attributes:
+    loader (callable): Loads one chunk from a request, e.g. from a cache, a CSV file or a remote source.
+    requests (iterable): The requests to load, one per chunk.
+    max_prefetch (int): The maximum number of chunks loaded ahead of the consumer.
+    num_workers (int): The number of loader threads.
+    """
+    def __init__(self, loader, requests, max_prefetch=4, num_workers=2):
+        if not isinstance(max_prefetch, int) or max_prefetch <= 0:
+            raise ValueError("max_prefetch must be a positive integer")
+        if not isinstance(num_workers, int) or num_workers <= 0:
+            raise ValueError("num_workers must be a positive integer")
+        self.loader = loader
+        self.requests = requests
+        self.max_prefetch = max_prefetch
+        self.num_workers = num_workers
+
+    def __iter__(self):
+        """
+        Yield (request, chunk) pairs in request order.
+        """
+        requests = iter(self.requests)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            try:
+                for request in itertools.islice(requests, self.max_prefetch):
+                    pending.append((request, executor.submit(self.loader, request)))
+                while pending:
+                    request, future = pending.popleft()
+                    chunk = future.result()
+                    for next_request in itertools.islice(requests, 1):
+                        pending.append((next_request, executor.submit(self.loader, next_request)))
+                    yield request, chunk
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+
+class ChunkPrefetcher:
+    """
+    The ChunkPrefetcher consumes an iterable of chunks on a background thread, e.g. a generator that reads
+    and parses a file, and hands them to the caller through a bounded queue.
+
+    At most max_prefetch chunks wait in the queue, so memory stays bounded. An exception raised while
+    producing a chunk is re-raised when the caller reaches it. The chunks are usually a one-shot generator,
+    so a ChunkPrefetcher can only be iterated once; create a new one to read the data again.
+
+    Attributes:
+    chunks (iterable): The chunks to produce, in order.
+    max_prefetch (int): The maximum number of chunks produced ahead of the consumer.
+    """
+    _DONE = object()
+
+    def __init__(self, chunks, max_prefetch=4):
+        if not isinstance(max_prefetch, int) or max_prefetch <= 0:
+            raise ValueError("max_prefetch must be a positive integer")
+        self.chunks = chunks
+        self.max_prefetch = max_prefetch
+        self._iterated = False
+
+    def __iter__(self):
+        """
+        Yield (index, chunk) pairs in order.
+        """
+        if self._iterated:
+            raise RuntimeError("ChunkPrefetcher can only be iterated once, create a new one to read the data again")
+        self._iterated = True
+        return self._iterate()
+
+    def _iterate(self):
+        buffer = queue.Queue(maxsize=self.max_prefetch)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(buffer, stop), daemon=True)
+        producer.start()
+        try:
+            index = 0
+            while True:
+                chunk, error = buffer.get()
+                if error is not None:
+                    raise error
+                if chunk is self._DONE:
+                    return
+                yield index, chunk
+                index += 1
+        finally:
+            stop.set()
+            producer.join()
+
+    def _produce(self, buffer, stop):
+        try:
+            for chunk in self.chunks:
+                if not self._put(buffer, stop, (chunk, None)):
+                    return
+        except Exception as error:
+            self._put(buffer, stop, (None, error))
+            return
+        self._put(buffer, stop, (self._DONE, None))
+
+    @staticmethod
+    def _put(buffer, stop, item):
+        # Time out regularly so the producer notices when the consumer has stopped
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -0,0 +1,307 @@
+import datetime
+import numbers
+import os
+import shutil
+import numpy as np
+
+
+class ResultsWriter:
+    """
+    The ResultsWriter streams backtest outputs to a columnar on-disk store.
+
+    Rows are buffered per table and flushed in batches as append-only .npy chunks,
+    one file per column, so memory stays bounded no matter how long the run is.
+    The layout is <root_dir>/<run_id>/<table>/<column>/chunk_<n>.npy.
+    Timezone-aware dates, e.g. yfinance intraday indexes, are stored as naive UTC.
+
+    Attributes:
+    root_dir (str): The directory holding all stored runs.
+    run_id (str): The name of the run being written.
+    batch_size (int): The number of rows buffered per table before a flush.
+    """
+    FILLS = 'fills'
+    EQUITY = 'equity'
+    METRICS = 'metrics'
+
+    def __init__(self, root_dir, run_id, batch_size=10000):
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        self.root_dir = root_dir
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.run_dir = os.path.join(root_dir, run_id)
+        self._buffers = {}
+        self._chunk_counts = {}
+        self._schemas = {}
+        os.makedirs(self.run_dir, exist_ok=True)
+
+    def record(self, table, **row):
+        """
+        Buffer a single row for the given table, flushing it once the batch is full.
+
+        Args:
+        table (str): The table name.
+        **row: The column values of the row.
+        """
+        schema = self.schema(table)
+        if schema is None:
+            schema = self._schemas[table] = sorted(row)
+        elif sorted(row) != schema:
+            raise ValueError(f"Columns {sorted(row)} do not match table '{table}' columns {schema}")
+        buffer = self._buffers.setdefault(table, {})
+        for column, value in row.items():
+            buffer.setdefault(column, []).append(value)
+        if len(next(iter(buffer.values()))) >= self.batch_size:
+            self.flush_table(table)
+
+    def record_fill(self, date, ticker, quantity, price, side):
+        """
+        Record an executed trade.
+        """
+        self.record(self.FILLS, date=date, ticker=ticker, quantity=quantity, price=price, side=side)
+
+    def record_equity(self, date, total_value, cash):
+        """
+        Record a point of the equity curve.
+        """
+        self.record(self.EQUITY, date=date, total_value=total_value, cash=cash)
+
+    def record_metrics(self, date, **metrics):
+        """
+        Record per-bar metrics. The same metric names must be used on every bar.
+        """
+        self.record(self.METRICS, date=date, **metrics)
+
+    def flush_table(self, table):
+        """
+        Write the buffered rows of a table as a new chunk.
+
+        Args:
+        table (str): The table name.
+        """
+        buffer = self._buffers.get(table)
+        if not buffer or not next(iter(buffer.values())):
+            return
+        chunk_index = self.chunk_count(table)
+        for column, values in buffer.items():
+            column_dir = os.path.join(self.run_dir, table, column)
+            os.makedirs(column_dir, exist_ok=True)
+            np.save(os.path.join(column_dir, f"chunk_{chunk_index:06d}.npy"), _to_array(values))
+        self._chunk_counts[table] = chunk_index + 1
+        self._buffers[table] = {}
+
+    def flush(self):
+        """
+        Write the buffered rows of all tables.
+        """
+        for table in list(self._buffers):
+            self.flush_table(table)
+
+    def close(self):
+        """
+        Flush any remaining rows. The writer should not be used afterwards.
+        """
+        self.flush()
+
+    def chunk_count(self, table):
+        """
+        Return the number of chunks written so far for a table, including chunks from earlier sessions.
+
+        Args:
+        table (str): The table name.
+
+        Returns:
+        int: The number of chunks on disk.
+        """
+        if table not in self._chunk_counts:
+            self._chunk_counts[table] = len(_chunk_files(os.path.join(self.run_dir, table)))
+        return self._chunk_counts[table]
+
+    def schema(self, table):
+        """
+        Return the sorted column names of a table, read from disk for tables written by earlier sessions.
+
+        Args:
+        table (str): The table name.
+
+        Returns:
+        list: The column names, or None if nothing was recorded for the table yet.
+        """
+        if table not in self._schemas:
+            table_dir = os.path.join(self.run_dir, table)
+            if not os.path.isdir(table_dir):
+                return None
+            self._schemas[table] = sorted(os.listdir(table_dir))
+        return self._schemas[table]
+
+    def chunk_counts(self):
+        """
+        Return the number of chunks on disk for every table of the run.
+        """
+        tables = set(self._buffers) | set(self._chunk_counts)
+        if os.path.isdir(self.run_dir):
+            tables |= set(os.listdir(self.run_dir))
+        return {table: self.chunk_count(table) for table in sorted(tables)}
+
+    def truncate(self, chunk_counts):
+        """
+        Drop buffered rows and remove the chunks written after the given counts, e.g. when resuming
+        from a checkpoint.
+
+        Args:
+        chunk_counts (dict): The number of chunks to keep per table. Tables not listed are removed.
+        """
+        self._buffers = {}
+        self._chunk_counts = {}
+        self._schemas = {}
+        if not os.path.isdir(self.run_dir):
+            return
+        for table in os.listdir(self.run_dir):
+            table_dir = os.path.join(self.run_dir, table)
+            keep = chunk_counts.get(table, 0)
+            if keep == 0:
+                shutil.rmtree(table_dir)
+                continue
+            for column in os.listdir(table_dir):
+                column_dir = os.path.join(table_dir, column)
+                for chunk_file in sorted(os.listdir(column_dir))[keep:]:
+                    os.remove(os.path.join(column_dir, chunk_file))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ResultsReader:
+    """
+    The ResultsReader loads runs written by a ResultsWriter.
+
+    Attributes:
+    root_dir (str): The directory holding all stored runs.
+    """
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+    def list_runs(self):
+        """
+        Return the names of all stored runs.
+        """
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(name for name in os.listdir(self.root_dir)
+                      if os.path.isdir(os.path.join(self.root_dir, name)))
+
+    def list_tables(self, run_id):
+        """
+        Return the table names stored for a run.
+        """
+        return sorted(os.listdir(os.path.join(self.root_dir, run_id)))
+
+    def list_columns(self, run_id, table):
+        """
+        Return the column names stored for a table of a run.
+        """
+        return sorted(os.listdir(os.path.join(self.root_dir, run_id, table)))
+
+    def iter_chunks(self, run_id, table, columns=None, mmap=True):
+        """
+        Iterate over the chunks of a table one at a time, keeping memory bounded.
+
+        Args:
+        run_id (str): The run name.
+        table (str): The table name.
+        columns (list): The columns to load. All columns are loaded when None.
+        mmap (bool): Whether to memory-map the chunk files instead of reading them.
+
+        Returns:
+        generator: Dictionaries mapping column names to numpy arrays.
+        """
+        table_dir = os.path.join(self.root_dir, run_id, table)
+        if columns is None:
+            columns = self.list_columns(run_id, table)
+        mmap_mode = 'r' if mmap else None
+        for chunk_file in _chunk_files(table_dir):
+            yield {column: np.load(os.path.join(table_dir, column, chunk_file), mmap_mode=mmap_mode)
+                   for column in columns}
+
+    def load(self, run_id, table, columns=None, mmap=True):
+        """
+        Load selected columns of a table as contiguous arrays.
+
+        Args:
+        run_id (str): The run name.
+        table (str): The table name.
+        columns (list): The columns to load. All columns are loaded when None.
+        mmap (bool): Whether to memory-map the chunk files instead of reading them.
+
+        Returns:
+        dict: Column names mapped to numpy arrays.
+        """
+        if columns is None:
+            columns = self.list_columns(run_id, table)
+        chunks = list(self.iter_chunks(run_id, table, columns, mmap=mmap))
+        if len(chunks) == 1:
+            return chunks[0]
+        return {column: np.concatenate([chunk[column] for chunk in chunks]) if chunks else np.array([])
+                for column in columns}
+
+    def load_frame(self, run_id, table, columns=None):
+        """
+        Load selected columns of a table as a pandas DataFrame.
+        """
+        import pandas as pd
+        return pd.DataFrame(self.load(run_id, table, columns, mmap=False))
+
+    def load_runs(self, run_ids, table, columns=None):
+        """
+        Load the same table from several runs into one DataFrame with a 'run_id' column.
+        """
+        import pandas as pd
+        frames = []
+        for run_id in run_ids:
+            frame = self.load_frame(run_id, table, columns)
+            frame.insert(0, 'run_id', run_id)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+
+def _chunk_files(table_dir):
+    """
+    Return the sorted chunk file names of a table, read from its first column.
+    """
+    if not os.path.isdir(table_dir):
+        return []
+    column_dirs = sorted(os.listdir(table_dir))
+    if not column_dirs:
+        return []
+    return sorted(name for name in os.listdir(os.path.join(table_dir, column_dirs[0]))
+                  if name.startswith('chunk_') and name.endswith('.npy'))
+
+
+def _to_array(values):
+    """
+    Convert buffered values to an array that can be saved without pickling.
+    Datetime-like columns become datetime64[ns] with timezone-aware values converted to naive UTC,
+    numeric columns become floats with None as NaN, and any other objects become fixed-width strings.
+    """
+    array = np.asarray(values)
+    if array.dtype != object:
+        return array
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, (datetime.date, np.datetime64)) for value in present):
+        return np.asarray([np.datetime64('NaT') if value is None else _to_naive_utc(value) for value in values],
+                          dtype='datetime64[ns]')
+    if all(isinstance(value, numbers.Number) for value in present):
+        return np.asarray([np.nan if value is None else value for value in values], dtype=float)
+    return np.asarray([str(value) for value in values])
+
+
+def _to_naive_utc(value):
+    """
+    Convert a timezone-aware datetime to naive UTC, numpy has no representation for timezones.
+    """
+    if getattr(value, 'tzinfo', None) is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,190 @@
+import unittest
+import os
+import tempfile
+import shutil
+import sys
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+
+# setting path
+sys.path.append('../quant_backtesting_framework')
+from quant_backtesting_framework.backtest_engine import BacktestEngine
+from quant_backtesting_framework.checkpoint import CheckpointManager
+from quant_backtesting_framework.data_handler import DataHandler
+from quant_backtesting_framework.portfolio import Portfolio
+from quant_backtesting_framework.prefetch import ChunkPrefetcher
+from quant_backtesting_framework.results_store import ResultsWriter, ResultsReader
+
+PRICES = [100.0, 101.0, 99.0, 102.0, 104.0, 103.0, 105.0, 107.0, 106.0, 108.0]
+DATES = pd.date_range(start='2020-01-01', periods=len(PRICES), freq='D')
+
+
+class StubPortfolio(Portfolio):
+    def adjust_for_transaction_cost(self, transaction_cost):
+        self.cash -= transaction_cost
+
+
+class StubDataHandler:
+    """
+    Serves one price per date and raises at crash_at to simulate a crash mid-run.
+    """
+    def __init__(self, crash_at=None):
+        self.crash_at = crash_at
+
+    def get_dates(self):
+        return DATES
+
+    def get_current_data(self, current_date):
+        bar_index = DATES.get_loc(current_date)
+        if bar_index == self.crash_at:
+            raise RuntimeError("simulated crash")
+        return PRICES[bar_index]
+
+
+class StubStrategy:
+    """
+    Buys on bars 1 and 6, sells on bar 4.
+    """
+    def __init__(self):
+        self.bar_index = -1
+
+    def generate_signals(self, price):
+        self.bar_index = PRICES.index(price)
+        if self.bar_index in (1, 6):
+            return [SimpleNamespace(ticker='AAPL', quantity=10, signal_type='BUY', price=price)]
+        if self.bar_index == 4:
+            return [SimpleNamespace(ticker='AAPL', quantity=10, signal_type='SELL', price=price)]
+        return []
+
+
+def create_engine(results_writer, data_handler=None, **kwargs):
+    return BacktestEngine(strategy=StubStrategy(),
+                          portfolio=StubPortfolio(10000),
+                          execution_handler=SimpleNamespace(execute_order=lambda signal: (signal.price, 0)),
+                          risk_manager=SimpleNamespace(volatility=None, assess_trade_risk=lambda portfolio, signal: True),
+                          data_handler=data_handler or StubDataHandler(),
+                          results_writer=results_writer,
+                          **kwargs)
+
+
+class TestBacktestEngine(unittest.TestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.reader = ResultsReader(self.root_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+        shutil.rmtree(self.checkpoint_dir)
+
+    def test_records_results(self):
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=3))
+        engine.run_backtest()
+        equity = self.reader.load('run_a', ResultsWriter.EQUITY)
+        np.testing.assert_array_equal(equity['date'], DATES.values)
+        fills = self.reader.load_frame('run_a', ResultsWriter.FILLS)
+        self.assertEqual(list(fills['side']), ['BUY', 'SELL', 'BUY'])
+        metrics = self.reader.load('run_a', ResultsWriter.METRICS)
+        self.assertEqual(len(metrics['drawdown']), len(DATES))
+        self.assertTrue(np.all(np.isnan(metrics['volatility'])))
+        self.assertEqual(list(metrics['n_positions']), [0, 1, 1, 1, 0, 0, 1, 1, 1, 1])
+
+    def test_keep_history(self):
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a'), keep_history=False)
+        engine.run_backtest()
+        self.assertEqual(engine.portfolio.transaction_log, [])
+        self.assertEqual(engine.portfolio.total_value_history, [])
+        self.assertEqual(len(self.reader.load('run_a', ResultsWriter.FILLS)['side']), 3)
+        with self.assertRaises(ValueError):
+            create_engine(None, keep_history=False)
+
+    def run_with_crash(self, crash_at, every_n_bars, **kwargs):
+        """
+        Runs until the simulated crash, then resumes with fresh components as a new process would.
+        """
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2),
+                               data_handler=StubDataHandler(crash_at=crash_at),
+                               checkpoint_manager=CheckpointManager(self.checkpoint_dir, every_n_bars=every_n_bars),
+                               **kwargs)
+        with self.assertRaises(RuntimeError):
+            engine.run_backtest()
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2),
+                               checkpoint_manager=CheckpointManager(self.checkpoint_dir, every_n_bars=every_n_bars),
+                               **kwargs)
+        engine.resume_backtest()
+        return engine
+
+    def assert_matches_clean_run(self, engine):
+        clean_engine = create_engine(ResultsWriter(self.root_dir, 'clean', batch_size=2))
+        clean_engine.run_backtest()
+        for table in [ResultsWriter.FILLS, ResultsWriter.EQUITY, ResultsWriter.METRICS]:
+            expected = self.reader.load_frame('clean', table)
+            pd.testing.assert_frame_equal(self.reader.load_frame('run_a', table), expected)
+        self.assertEqual(engine.portfolio.cash, clean_engine.portfolio.cash)
+        self.assertEqual(engine.portfolio.positions, clean_engine.portfolio.positions)
+        return clean_engine
+
+    def test_resume_after_checkpoint(self):
+        # Bars 4 and 5 were flushed after the checkpoint at bar 4 and must be discarded on resume
+        engine = self.run_with_crash(crash_at=7, every_n_bars=4)
+        clean_engine = self.assert_matches_clean_run(engine)
+        self.assertEqual(engine.portfolio.transaction_log, clean_engine.portfolio.transaction_log)
+        self.assertEqual(engine.portfolio.total_value_history, clean_engine.portfolio.total_value_history)
+
+    def test_resume_without_checkpoint(self):
+        # Bars 0 to 3 were flushed before any checkpoint was written
+        engine = self.run_with_crash(crash_at=5, every_n_bars=100)
+        self.assert_matches_clean_run(engine)
+
+    def test_resume_without_history(self):
+        engine = self.run_with_crash(crash_at=7, every_n_bars=4, keep_history=False)
+        self.assert_matches_clean_run(engine)
+        self.assertEqual(engine.portfolio.total_value_history, [])
+
+    def test_fresh_run_replaces_earlier_run(self):
+        create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2),
+                      checkpoint_manager=CheckpointManager(self.checkpoint_dir, every_n_bars=4)).run_backtest()
+        engine = self.run_with_crash(crash_at=7, every_n_bars=4)
+        self.assertEqual(len(self.reader.load('run_a', ResultsWriter.EQUITY)['date']), len(DATES))
+        self.assert_matches_clean_run(engine)
+
+    def write_csv(self):
+        path = os.path.join(self.checkpoint_dir, 'prices.csv')
+        pd.DataFrame({'Date': DATES, 'Open': PRICES, 'Close': PRICES}).to_csv(path, index=False)
+        return path
+
+    def test_pipelined_backtest(self):
+        path = self.write_csv()
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2))
+        engine.run_pipelined_backtest(DataHandler().stream_custom_data(path, '2020-01-01', '2020-01-10', chunk_rows=3))
+        clean_engine = self.assert_matches_clean_run(engine)
+        self.assertEqual(engine.portfolio.total_value_history, clean_engine.portfolio.total_value_history)
+
+    def test_resume_pipelined_backtest(self):
+        path = self.write_csv()
+        handler = DataHandler()
+
+        def crashing_chunks():
+            for bar_index, chunk in enumerate(handler.iter_custom_data(path, '2020-01-01', '2020-01-10', chunk_rows=1)):
+                if bar_index == 7:
+                    raise RuntimeError("simulated crash")
+                yield chunk
+
+        prefetcher = ChunkPrefetcher(crashing_chunks())
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2),
+                               checkpoint_manager=CheckpointManager(self.checkpoint_dir, every_n_bars=4))
+        with self.assertRaises(RuntimeError):
+            engine.run_pipelined_backtest(prefetcher)
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2),
+                               checkpoint_manager=CheckpointManager(self.checkpoint_dir, every_n_bars=4))
+        # The consumed prefetcher of the crashed run cannot silently be reused
+        with self.assertRaises(RuntimeError):
+            engine.resume_backtest(prefetcher=prefetcher)
+        engine = create_engine(ResultsWriter(self.root_dir, 'run_a', batch_size=2),
+                               checkpoint_manager=CheckpointManager(self.checkpoint_dir, every_n_bars=4))
+        engine.resume_backtest(prefetcher=handler.stream_custom_data(path, '2020-01-01', '2020-01-10', chunk_rows=3))
+        self.assert_matches_clean_run(engine)
+
+if __name__ == '__main__':
+    unittest.main()
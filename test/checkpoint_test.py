@@ -0,0 +1,108 @@
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from types import SimpleNamespace
+
+# setting path
+sys.path.append('../quant_backtesting_framework')
+from quant_backtesting_framework.checkpoint import CheckpointManager
+from quant_backtesting_framework.portfolio import Portfolio
+from quant_backtesting_framework.risk_management import RiskManagement
+
+class TestCheckpointManager(unittest.TestCase):
+    def setUp(self):
+        self.checkpoint_dir = tempfile.mkdtemp()
+        self.manager = CheckpointManager(self.checkpoint_dir, every_n_bars=2, max_snapshots=3)
+        self.engine = self.create_engine()
+
+    def tearDown(self):
+        shutil.rmtree(self.checkpoint_dir)
+
+    @staticmethod
+    def create_engine():
+        return SimpleNamespace(portfolio=Portfolio(10000),
+                               risk_manager=RiskManagement(),
+                               execution_handler=SimpleNamespace(open_orders=[]),
+                               results_writer=None)
+
+    def test_should_checkpoint(self):
+        self.assertFalse(self.manager.should_checkpoint(0))
+        self.assertFalse(self.manager.should_checkpoint(1))
+        self.assertTrue(self.manager.should_checkpoint(2))
+
+    def test_save_and_restore(self):
+        portfolio = self.engine.portfolio
+        portfolio.update_position('AAPL', 10, 100, 'BUY')
+        self.engine.risk_manager.volatility = 0.2
+        self.manager.save(self.engine, 2)
+        portfolio.update_position('MSFT', 5, 200, 'BUY')
+        portfolio.update_position('AAPL', 10, 110, 'SELL')
+        self.engine.execution_handler.open_orders.append(('MSFT', 5, 'SELL'))
+        self.manager.save(self.engine, 4)
+
+        restored = self.create_engine()
+        cursor = CheckpointManager(self.checkpoint_dir).restore(restored)
+        self.assertEqual(cursor, 4)
+        self.assertEqual(restored.portfolio.cash, portfolio.cash)
+        self.assertEqual(restored.portfolio.positions, {'MSFT': 5})
+        self.assertEqual(restored.portfolio.transaction_log, portfolio.transaction_log)
+        self.assertEqual(restored.portfolio.total_value_history, portfolio.total_value_history)
+        self.assertEqual(restored.risk_manager.volatility, 0.2)
+        self.assertEqual(restored.execution_handler.open_orders, [('MSFT', 5, 'SELL')])
+
+    def test_incremental_snapshot(self):
+        self.engine.portfolio.update_position('AAPL', 10, 100, 'BUY')
+        self.manager.save(self.engine, 2)
+        self.engine.portfolio.update_position('AAPL', 5, 100, 'BUY')
+        self.manager.save(self.engine, 4)
+        snapshot = self.manager._read(CheckpointManager.SNAPSHOT, 1)
+        self.assertFalse(snapshot['base'])
+        history = self.manager._read(CheckpointManager.HISTORY, 1)
+        self.assertEqual(history['transaction_log'], [('AAPL', 5, 100, 'BUY')])
+        self.assertEqual(snapshot['positions'], {'AAPL': 15})
+        self.assertNotIn('risk_manager.volatility', snapshot['scalars'])
+
+    def test_new_base_removes_old_snapshots(self):
+        for cursor in range(2, 12, 2):
+            self.engine.portfolio.calculate_total_value(100)
+            self.manager.save(self.engine, cursor)
+        self.assertEqual(sorted(os.listdir(self.checkpoint_dir)),
+                         [f'history_0000000{i}.ckpt' for i in range(5)] + ['snapshot_00000004.ckpt'])
+        restored = self.create_engine()
+        self.assertEqual(CheckpointManager(self.checkpoint_dir).restore(restored), 10)
+        self.assertEqual(restored.portfolio.total_value_history, self.engine.portfolio.total_value_history)
+
+    def test_history_segments_are_not_rewritten(self):
+        for cursor in range(2, 12, 2):
+            self.engine.portfolio.calculate_total_value(100)
+            self.manager.save(self.engine, cursor)
+        base_history = self.manager._read(CheckpointManager.HISTORY, 4)
+        self.assertEqual(base_history['total_value_history'], [10000])
+        self.assertNotIn('appends', self.manager._read(CheckpointManager.SNAPSHOT, 4))
+
+    def test_history_is_skipped_without_keep_history(self):
+        self.engine.keep_history = False
+        self.engine.portfolio.calculate_total_value(100)
+        self.manager.save(self.engine, 2)
+        self.assertEqual(os.listdir(self.checkpoint_dir), ['snapshot_00000000.ckpt'])
+        restored = self.create_engine()
+        restored.keep_history = False
+        self.assertEqual(CheckpointManager(self.checkpoint_dir).restore(restored), 2)
+        self.assertEqual(restored.portfolio.total_value_history, [])
+        self.assertEqual(restored.portfolio.cash, 10000)
+
+    def test_fresh_run_removes_earlier_files(self):
+        self.manager.save(self.engine, 2)
+        self.manager.save(self.engine, 4)
+        manager = CheckpointManager(self.checkpoint_dir)
+        engine = self.create_engine()
+        with self.assertRaises(ValueError):
+            manager.save(engine, 2)
+        manager.start_run(engine)
+        manager.save(engine, 2)
+        self.assertEqual(sorted(os.listdir(self.checkpoint_dir)), ['history_00000000.ckpt', 'snapshot_00000000.ckpt'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 import pandas as pd
+import os
+import subprocess
+import tempfile
 import sys
  
 # setting path
@@ -37,5 +40,57 @@ class TestDataHandler(unittest.TestCase):
         data = self.handler.lower_column_names(data)
         self.assertTrue('open' in data.columns)
 
+    def write_csv(self, dates):
+        data = pd.DataFrame({
+            'Date': dates,
+            'Open': [float(x) for x in range(len(dates))],
+            'Close': [float(x) + 0.5 for x in range(len(dates))],
+        })
+        data.loc[3, 'Close'] = None
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+        data.to_csv(path, index=False)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_iter_custom_data(self):
+        # Several rows per date so that dates straddle chunk boundaries
+        dates = [str(date) for date in pd.date_range('2020-01-01', periods=20, freq='D') for _ in range(3)]
+        path = self.write_csv(dates)
+        expected = self.handler.load_custom_data(path, '2020-01-03', '2020-01-15')
+        for chunk_rows in [1, 4, 7, 100]:
+            chunks = list(self.handler.iter_custom_data(path, '2020-01-03', '2020-01-15', chunk_rows=chunk_rows))
+            self.assertEqual(sum(len(set(chunk.index)) for chunk in chunks), len(set(expected.index)))
+            # load_custom_data sorts with an unstable sort, so compare rows within a date in any order
+            pd.testing.assert_frame_equal(pd.concat(chunks).reset_index().sort_values(['date', 'open'], ignore_index=True),
+                                          expected.reset_index().sort_values(['date', 'open'], ignore_index=True))
+
+    def test_iter_custom_data_resampled(self):
+        dates = [str(date) for date in pd.date_range('2020-01-01 09:30', periods=40, freq='17min')]
+        path = self.write_csv(dates)
+        expected = self.handler.preprocess_data(self.handler.load_custom_data(path, '2020-01-01', '2020-01-02'),
+                                                frequency='7min')
+        for chunk_rows in [1, 5, 100]:
+            chunks = self.handler.stream_custom_data(path, '2020-01-01', '2020-01-02',
+                                                     frequency='7min', chunk_rows=chunk_rows)
+            pd.testing.assert_frame_equal(pd.concat([chunk for _, chunk in chunks]), expected, check_freq=False)
+
+    def test_prefetch_data(self):
+        paths = [self.write_csv([str(date) for date in pd.date_range('2020-01-01', periods=10, freq='D')])
+                 for _ in range(3)]
+        requests = [{'ticker': f'T{i}', 'start_date': '2020-01-02', 'end_date': '2020-01-08', 'use_path': True,
+                     'custom_filepath': path, 'adjust_dataframe': False, 'add_all_technical_indicator': False}
+                    for i, path in enumerate(paths)]
+        results = list(self.handler.prefetch_data(requests, max_prefetch=2))
+        self.assertEqual([request['ticker'] for request, _ in results], ['T0', 'T1', 'T2'])
+        for request, data in results:
+            pd.testing.assert_frame_equal(data, self.handler.fetch_data(**request))
+
+    def test_import_is_lazy(self):
+        code = ("import sys; import quant_backtesting_framework.data_handler; "
+                "print(','.join(name for name in ['yfinance', 'ta'] if name in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '')
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import unittest
+import threading
+import time
+import sys
+
+# setting path
+sys.path.append('../quant_backtesting_framework')
+from quant_backtesting_framework.prefetch import DataPrefetcher, ChunkPrefetcher
+
+class TestDataPrefetcher(unittest.TestCase):
+    def test_yields_in_request_order(self):
+        # Stubbed remote source where earlier requests are slower
+        def loader(request):
+            time.sleep(0.01 * (5 - request))
+            return request * 10
+
+        chunks = list(DataPrefetcher(loader, range(5), max_prefetch=3, num_workers=3))
+        self.assertEqual(chunks, [(0, 0), (1, 10), (2, 20), (3, 30), (4, 40)])
+
+    def test_prefetch_is_bounded(self):
+        started = []
+        lock = threading.Lock()
+
+        def loader(request):
+            with lock:
+                started.append(request)
+            return request
+
+        prefetcher = iter(DataPrefetcher(loader, range(100), max_prefetch=2, num_workers=2))
+        next(prefetcher)
+        time.sleep(0.05)
+        self.assertLessEqual(len(started), 3)
+        prefetcher.close()
+
+    def test_loader_error_is_raised(self):
+        def loader(request):
+            if request == 1:
+                raise IOError("remote source unavailable")
+            return request
+
+        prefetcher = iter(DataPrefetcher(loader, range(3)))
+        self.assertEqual(next(prefetcher), (0, 0))
+        with self.assertRaises(IOError):
+            next(prefetcher)
+
+    def test_validate_inputs(self):
+        with self.assertRaises(ValueError):
+            DataPrefetcher(lambda request: request, [], max_prefetch=0)
+        with self.assertRaises(ValueError):
+            DataPrefetcher(lambda request: request, [], num_workers=0)
+
+class TestChunkPrefetcher(unittest.TestCase):
+    def test_yields_in_order(self):
+        chunks = list(ChunkPrefetcher(iter(['a', 'b', 'c']), max_prefetch=1))
+        self.assertEqual(chunks, [(0, 'a'), (1, 'b'), (2, 'c')])
+
+    def test_iterates_once(self):
+        prefetcher = ChunkPrefetcher(iter(['a', 'b']))
+        self.assertEqual(len(list(prefetcher)), 2)
+        with self.assertRaises(RuntimeError):
+            iter(prefetcher)
+
+    def test_prefetch_is_bounded(self):
+        produced = []
+
+        def chunks():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        prefetcher = iter(ChunkPrefetcher(chunks(), max_prefetch=2))
+        next(prefetcher)
+        time.sleep(0.05)
+        # One chunk handed over, two waiting in the queue and one blocked on a full queue
+        self.assertLessEqual(len(produced), 4)
+        prefetcher.close()
+
+    def test_producer_error_is_raised(self):
+        def chunks():
+            yield 0
+            raise IOError("corrupt file")
+
+        prefetcher = iter(ChunkPrefetcher(chunks()))
+        self.assertEqual(next(prefetcher), (0, 0))
+        with self.assertRaises(IOError):
+            next(prefetcher)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import tempfile
+import shutil
+import sys
+import warnings
+import numpy as np
+import pandas as pd
+
+# setting path
+sys.path.append('../quant_backtesting_framework')
+from quant_backtesting_framework.results_store import ResultsWriter, ResultsReader
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.dates = pd.date_range(start='2020-01-01', periods=25, freq='D')
+
+    def tearDown(self):
+        shutil.rmtree(self.root_dir)
+
+    def test_equity_round_trip(self):
+        with ResultsWriter(self.root_dir, 'run_a', batch_size=10) as writer:
+            for i, date in enumerate(self.dates):
+                writer.record_equity(date, 100.0 + i, 50.0)
+        reader = ResultsReader(self.root_dir)
+        self.assertEqual(len(list(reader.iter_chunks('run_a', ResultsWriter.EQUITY))), 3)
+        equity = reader.load('run_a', ResultsWriter.EQUITY, columns=['date', 'total_value'])
+        self.assertEqual(set(equity), {'date', 'total_value'})
+        np.testing.assert_array_equal(equity['total_value'], np.arange(100.0, 125.0))
+        self.assertEqual(equity['date'].dtype, np.dtype('datetime64[ns]'))
+
+    def test_fills_frame_and_runs(self):
+        for run_id in ['run_a', 'run_b']:
+            with ResultsWriter(self.root_dir, run_id) as writer:
+                writer.record_fill(self.dates[0], 'AAPL', 10, 100.0, 'BUY')
+                writer.record_fill(self.dates[1], 'AAPL', 10, 101.0, 'SELL')
+        reader = ResultsReader(self.root_dir)
+        self.assertEqual(reader.list_runs(), ['run_a', 'run_b'])
+        fills = reader.load_runs(reader.list_runs(), ResultsWriter.FILLS)
+        self.assertEqual(len(fills), 4)
+        self.assertEqual(list(fills['side']), ['BUY', 'SELL', 'BUY', 'SELL'])
+
+    def test_appends_after_reopen(self):
+        with ResultsWriter(self.root_dir, 'run_a') as writer:
+            writer.record_metrics(self.dates[0], drawdown=0.0)
+        with ResultsWriter(self.root_dir, 'run_a') as writer:
+            writer.record_metrics(self.dates[1], drawdown=0.1)
+        metrics = ResultsReader(self.root_dir).load('run_a', ResultsWriter.METRICS)
+        np.testing.assert_array_equal(metrics['drawdown'], [0.0, 0.1])
+
+    def test_mismatched_columns(self):
+        writer = ResultsWriter(self.root_dir, 'run_a')
+        writer.record_metrics(self.dates[0], drawdown=0.0)
+        with self.assertRaises(ValueError):
+            writer.record_metrics(self.dates[1], sharpe=1.0)
+
+    def test_mismatched_columns_after_flush_and_reopen(self):
+        with ResultsWriter(self.root_dir, 'run_a', batch_size=1) as writer:
+            writer.record_metrics(self.dates[0], drawdown=0.0)
+            with self.assertRaises(ValueError):
+                writer.record_metrics(self.dates[1], sharpe=1.0)
+        writer = ResultsWriter(self.root_dir, 'run_a')
+        with self.assertRaises(ValueError):
+            writer.record_metrics(self.dates[1], sharpe=1.0)
+
+    def test_missing_values(self):
+        with ResultsWriter(self.root_dir, 'run_a', batch_size=2) as writer:
+            writer.record_metrics(self.dates[0], volatility=None, n_positions=None)
+            writer.record_metrics(self.dates[1], volatility=None, n_positions=1)
+            writer.record_metrics(self.dates[2], volatility=0.2, n_positions=2)
+            writer.record_metrics(self.dates[3], volatility=None, n_positions=None)
+        metrics = ResultsReader(self.root_dir).load('run_a', ResultsWriter.METRICS)
+        np.testing.assert_array_equal(metrics['volatility'], [np.nan, np.nan, 0.2, np.nan])
+        np.testing.assert_array_equal(metrics['n_positions'], [np.nan, 1.0, 2.0, np.nan])
+        self.assertEqual(metrics['date'].dtype, np.dtype('datetime64[ns]'))
+
+    def test_timezone_aware_dates(self):
+        dates = pd.date_range(start='2020-01-02 09:30', periods=3, freq='min', tz='America/New_York')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            with ResultsWriter(self.root_dir, 'run_a') as writer:
+                for date in dates:
+                    writer.record_equity(date, 100.0, 50.0)
+            equity = ResultsReader(self.root_dir).load('run_a', ResultsWriter.EQUITY)
+        np.testing.assert_array_equal(equity['date'], dates.tz_convert('UTC').tz_localize(None).values)
+
+    def test_truncate(self):
+        writer = ResultsWriter(self.root_dir, 'run_a', batch_size=1)
+        for i, date in enumerate(self.dates[:3]):
+            writer.record_equity(date, 100.0 + i, 50.0)
+            writer.record_metrics(date, drawdown=0.0)
+        writer.truncate({ResultsWriter.EQUITY: 2})
+        reader = ResultsReader(self.root_dir)
+        self.assertEqual(reader.list_tables('run_a'), [ResultsWriter.EQUITY])
+        np.testing.assert_array_equal(reader.load('run_a', ResultsWriter.EQUITY)['total_value'], [100.0, 101.0])
+        writer.record_equity(self.dates[3], 103.0, 50.0)
+        np.testing.assert_array_equal(reader.load('run_a', ResultsWriter.EQUITY)['total_value'], [100.0, 101.0, 103.0])
+
+if __name__ == '__main__':
+    unittest.main()